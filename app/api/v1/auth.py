@@ -1,27 +1,27 @@
+import json
 import logging
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Form
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from starlette import status
+from fastapi import APIRouter, Depends, HTTPException, Form, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette import status
 from app.db.base import get_db
 from app.core.config import settings
-import requests
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
 
 @router.post(
     "/token"
 )  # full route will be /auth/token matching the tokenUrl of OAuth2PasswordBearer
-def get_access_token(
+async def get_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: db_dependency,
+    request: Request,
     remember_me: bool = Form(False),  # Add remember_me field with default value False
 ):
     """
@@ -30,7 +30,8 @@ def get_access_token(
     Args:
 
         - form_data (OAuth2PasswordRequestForm): The form data containing the username and password.
-        - db (Session): The database session dependency.
+        - db (AsyncSession): The database session dependency.
+        - request (Request): The incoming request, used to reach the shared HTTP client.
         - remember_me (Bool): The form data containing the remember_me field to return a token with longer validity. Default is False.
 
     Returns:
@@ -49,52 +50,36 @@ def get_access_token(
 
         - HTTPException: If the user cannot be authenticated, or if any database or unexpected errors occur.
     """
-    try:
-        # print(form_data.username, form_data.password)
-        # print(remember_me)
-        # Authenticate the user by calling the AUTH-SERVICE
-        auth_service_url = f"{settings.AUTH_SERVICE_BASE_URL}/auth/token"
-        payload = {
-            "username": form_data.username,
-            "password": form_data.password,
-            "remember_me": remember_me,
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    # Authenticate the user by calling the AUTH-SERVICE
+    auth_service_url = f"{settings.AUTH_SERVICE_BASE_URL}/auth/token"
+    payload = {
+        "username": form_data.username,
+        "password": form_data.password,
+        "remember_me": remember_me,
+    }
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        # Call the AUTH-SERVICE to authenticate the user
-        # print(f"Calling AUTH-SERVICE at {auth_service_url} with payload: {payload}")
-        response = requests.post(auth_service_url, data=payload, headers=headers)
-
-        if response.status_code != 200:
-            raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Authentication failed: {response.json().get('detail', 'Unknown error')}",
-            )
+    # Call the AUTH-SERVICE to authenticate the user
+    client = request.app.state.http_client
+    response = await client.post(auth_service_url, data=payload, headers=headers)
 
+    try:
         response_data = response.json()
-        # print(response_data)
-        response = JSONResponse(content=response_data)
-        return response
-
-    except IntegrityError as e:
-        logging.error(f"Integrity error occurred: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
-    except SQLAlchemyError as e:
-        logging.error(f"Database error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred while authenticating the user with username {form_data.username}.",
+    except json.JSONDecodeError:
+        logging.error(
+            "Invalid JSON response from AUTH-SERVICE with status %s",
+            response.status_code,
         )
-    except HTTPException as e:
-        logging.error(f"HTTPException: {str(e)}")
         raise HTTPException(
-            status_code=e.status_code,
-            detail=e.detail,
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="AUTH-SERVICE returned an invalid response.",
         )
-    except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}")
-        logging.error(e)
+
+    if response.status_code != 200:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred while authenticating the user with username {form_data.username}.",
-        )
\ No newline at end of file
+            status_code=response.status_code,
+            detail=f"Authentication failed: {response_data.get('detail', 'Unknown error')}",
+        )
+
+    response = ORJSONResponse(content=response_data)
+    return response
\ No newline at end of file
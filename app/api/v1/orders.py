@@ -1,10 +1,11 @@
+import asyncio
 import logging
+import httpx
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
-import requests
-from sqlalchemy import asc, desc, select
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import asc, desc, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from starlette import status
 from app.core.security import check_permissions
 from app.db.base import get_db
@@ -18,17 +19,44 @@ from app.db.models.order_line import OrderLine
 from app.core.config import settings
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+# Columns allowed to order the orders by, add valid column names here
+ORDER_BY_COLUMNS = {
+    "order_id": OrderHeader.order_id,
+    "total_items": OrderHeader.total_items,
+    "created_at": OrderHeader.created_at,
+}
+
+# Number of orders returned when no limit is given, and the maximum that can be requested
+DEFAULT_ORDERS_LIMIT = 100
+MAX_ORDERS_LIMIT = 500
+
+
+# Send the quantity changes to INVENTORY-SERVICE concurrently, returns the response or the raised exception of each change
+async def change_item_quantities(
+    client: httpx.AsyncClient, changes: list[tuple[int, int]], headers: dict
+) -> list:
+    return await asyncio.gather(
+        *(
+            client.patch(
+                f"{settings.INVENTORY_SERVICE_BASE_URL}/items/{item_id}?change_quantity={quantity}",
+                headers=headers,
+            )
+            for item_id, quantity in changes
+        ),
+        return_exceptions=True,
+    )
+
 
 @router.post(
     "/",
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(check_permissions((["manage_orders_ORDER_SERVICE"])))],
 )
-def create_order(
+async def create_order(
     db: db_dependency, order_request: OrderHeaderCreateRequest, request: Request
 ):
     """
@@ -68,90 +96,86 @@ def create_order(
             the order ID and creation timestamp.
     """
 
-    try:
-        # IMPORTANT NOTE: for simplicity, we are not validating the order details like user, items, etc.
-        # In a more enhanced version, you would want to validate the user and items before creating the order.
-        # For example, you might want to check if the user exists and if the items are valid.
-        # You can also check if the items are in stock and reserve some quantity for the order.
-        # Another approach is to have the validation between services handled by the frontend or a consumer service that validating the order with INVENTORY-SERVICE or AUTH-SERVICE before calling ORDER-SERVICE.
-
-        # Create the checkout order
-        new_order = OrderHeader(
-            user_id=order_request.user_id,
-            total_items=len(order_request.order_lines),
+    # IMPORTANT NOTE: for simplicity, we are not validating the order details like user, items, etc.
+    # In a more enhanced version, you would want to validate the user and items before creating the order.
+    # For example, you might want to check if the user exists and if the items are valid.
+    # You can also check if the items are in stock and reserve some quantity for the order.
+    # Another approach is to have the validation between services handled by the frontend or a consumer service that validating the order with INVENTORY-SERVICE or AUTH-SERVICE before calling ORDER-SERVICE.
+
+    # Create the checkout order
+    new_order = OrderHeader(
+        user_id=order_request.user_id,
+        total_items=len(order_request.order_lines),
+    )
+    db.add(new_order)
+    await db.flush()  # Writes to the database to generate `order_id` but doesn't commit
+    order_id = new_order.order_id
+    # Create the checkout items with a single multi-row INSERT
+    await db.execute(
+        insert(OrderLine),
+        [
+            {
+                "order_id": order_id,
+                "line_number": index + 1,
+                "item_id": item.item_id,
+                "quantity": item.quantity,
+            }
+            for index, item in enumerate(order_request.order_lines)
+        ],
+    )
+
+    # Update the item quantities in INVENTORY-SERVICE concurrently, forwarding the caller's token
+    client = request.app.state.http_client
+    auth_header = {"Authorization": request.headers.get("Authorization")}
+    changes = [(item.item_id, item.quantity) for item in order_request.order_lines]
+    for item_id, quantity in changes:
+        logging.debug(
+            "Calling INVENTORY-SERVICE item_id=%s quantity=%s", item_id, quantity
         )
-        db.add(new_order)
-        db.flush()  # Writes to the database to generate `order_id` but doesn't commit
-        # print("new_order.order_id ", new_order.order_id)
-        # Create the checkout items
-        for index, item in enumerate(order_request.order_lines):
-            # print("OrderLine ", item)
-            order_line = OrderLine(
-                order_id=new_order.order_id,
-                line_number=index + 1,
-                item_id=item.item_id,
-                quantity=item.quantity,
-            )
-            db.add(order_line)
-            # Access the token from the request header
-            # print(
-            #     "request.headers.get('Authorization') ",
-            #     request.headers.get("Authorization"),
-            # )
-            print(
-                f"Calling INVENTORY-SERVICE at {settings.INVENTORY_SERVICE_BASE_URL}/items/{item.item_id}?change_quantity={item.quantity}"
+    responses = await change_item_quantities(client, changes, auth_header)
+    updated_changes = []
+    for (item_id, quantity), response in zip(changes, responses):
+        if isinstance(response, BaseException):
+            logging.error(
+                "Failed to update item_id=%s in INVENTORY-SERVICE: %r",
+                item_id,
+                response,
             )
-            response = requests.patch(
-                f"{settings.INVENTORY_SERVICE_BASE_URL}/items/{item.item_id}?change_quantity={item.quantity}",
-                headers={"Authorization": request.headers.get("Authorization")},
+        elif response.status_code != 200:
+            logging.error(
+                "Failed to update item_id=%s in INVENTORY-SERVICE: status %s",
+                item_id,
+                response.status_code,
             )
-            if response.status_code != 200:
-                # Rollback the transaction if the item update fails
-                db.rollback()
-                raise HTTPException(
-                    status_code=400, detail="Failed to update item quantity"
+        else:
+            updated_changes.append((item_id, quantity))
+    if len(updated_changes) < len(changes):
+        # Rollback the transaction if any item update fails
+        await db.rollback()
+        # All the calls were sent at once, so revert the items that were already updated
+        compensations = [(item_id, -quantity) for item_id, quantity in updated_changes]
+        responses = await change_item_quantities(client, compensations, auth_header)
+        for (item_id, quantity), response in zip(compensations, responses):
+            if isinstance(response, BaseException) or response.status_code != 200:
+                logging.error(
+                    "Failed to revert item_id=%s by change_quantity=%s in INVENTORY-SERVICE: %r",
+                    item_id,
+                    quantity,
+                    response,
                 )
-
-        # Commit the order and all lines
-        db.commit()
-
-        # print("Did go here!!!!")
-        # The order is committed, so we can now fetch the order and checkout items
-        stmt = select(OrderHeader).where(OrderHeader.order_id == new_order.order_id)
-        order_header_result = db.execute(stmt).scalars().first()
-        if order_header_result is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch the committed order.",
-            )
-
-        return {
-            "message": "Order created successfully",
-            "order": order_header_result.order_id,
-        }
-
-    except IntegrityError as e:
-        logging.error(f"Integrity error occurred: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
-    except SQLAlchemyError as e:
-        logging.error(f"Database error: {str(e)}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while processing the checkout.",
-        )
-    except HTTPException as e:
-        logging.error(f"HTTPException: {str(e)}")
-        raise HTTPException(
-            status_code=e.status_code,
-            detail=e.detail,
-        )
-    except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while processing the checkout.",
+            status_code=400, detail="Failed to update item quantity"
         )
 
+    # Commit the order and all lines
+    await db.commit()
+
+    # The order id was generated by the flush, no need to fetch the committed order again
+    return {
+        "message": "Order created successfully",
+        "order": order_id,
+    }
+
 
 @router.get(
     "/",
@@ -165,76 +189,73 @@ def create_order(
         )
     ],
 )
-def read_all_orders(
+async def read_all_orders(
     db: db_dependency,
-    limit: Optional[int] = Query(None, description="Number of records to return"),
+    limit: int = Query(
+        DEFAULT_ORDERS_LIMIT,
+        ge=1,
+        le=MAX_ORDERS_LIMIT,
+        description="Number of records to return",
+    ),
     order_by: Optional[str] = Query(None, description="Order by column"),
     ascending: Optional[bool] = Query(True, description="Sort in ascending order"),
+    after_id: Optional[int] = Query(
+        None, gt=0, description="Return the orders after the order with this id"
+    ),
 ):
     """
     Fetch all orders from the database along with their associated permissions.
 
     Args:
 
-        limit (int, optional): The number of records to return. Defaults to None.
+        limit (int, optional): The number of records to return, between 1 and 500. Defaults to 100.
         order_by (str, optional): The column to order the results by. Defaults to order_id.
         ascending (bool, optional): Sort in ascending order. Defaults to True.
+        after_id (int, optional): The id of the last order of the previous page, to fetch the next page.
         Note: the allowed columns are "order_id", "total_items", and "created_at".
     Returns:
 
         list[OrderHeader]: A list of OrderHeader objects with their associated items.
     Raises:
 
-        HTTPException: If an integrity error or any other database error occurs,
-                       an HTTPException is raised with an appropriate status code
-                       and error message.
+        HTTPException: If the order given by after_id is not found, or if an integrity error
+                       or any other database error occurs, an HTTPException is raised with
+                       an appropriate status code and error message.
     """
-    try:
-        allowed_columns = [
-            "order_id",
-            "total_items",
-            "created_at",
-        ]  # Add valid column names here
-
-        # Start building the query
-        stmt = select(OrderHeader)
-
-        # Apply ordering
-        # Validate and set the order_by column or a default value
-        if order_by is None:
-            order_by = "order_id"
-        order_by = (
-            order_by.lower() if order_by.lower() in allowed_columns else "order_id"
-        )
-        order_column = getattr(OrderHeader, order_by)
-        if order_column:
-            if ascending:
-                stmt = stmt.order_by(asc(order_column))
-            else:
-                stmt = stmt.order_by(desc(order_column))
-
-        # Apply limit
-        if limit is not None:
-            stmt = stmt.limit(limit)
-
-        # Execute the query
-        return db.execute(stmt).scalars().all()
-
-    except IntegrityError as e:
-        logging.error(f"Integrity error occurred: {str(e.orig)}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
-    except SQLAlchemyError as e:
-        logging.error(f"Database error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while fetching all orders.",
-        )
-    except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while fetching all orders.",
-        )
+    # Start building the query, loading the order lines of all orders in one extra query
+    stmt = select(OrderHeader).options(selectinload(OrderHeader.order_lines))
+
+    # Apply ordering
+    # Validate and set the order_by column or a default value
+    order_column = ORDER_BY_COLUMNS.get(
+        (order_by or "order_id").lower(), OrderHeader.order_id
+    )
+    # Use order_id as the tie-breaker so that pages are stable
+    sort_key = [order_column]
+    if order_column is not OrderHeader.order_id:
+        sort_key.append(OrderHeader.order_id)
+    direction = asc if ascending else desc
+    stmt = stmt.order_by(*(direction(column) for column in sort_key))
+
+    # Apply keyset pagination, continue after the sort key of the given order instead of using an offset
+    if after_id is not None:
+        cursor_row = (
+            await db.execute(select(*sort_key).where(OrderHeader.order_id == after_id))
+        ).first()
+        if cursor_row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"order with id {after_id} not found.",
+            )
+        position = tuple_(*sort_key)
+        cursor = tuple_(*cursor_row)
+        stmt = stmt.where(position > cursor if ascending else position < cursor)
+
+    # Apply limit
+    stmt = stmt.limit(limit)
+
+    # Execute the query
+    return (await db.execute(stmt)).scalars().all()
 
 
 @router.get(
@@ -249,7 +270,7 @@ def read_all_orders(
         )
     ],
 )
-def read_order(db: db_dependency, order_id: int = Path(gt=0)):
+async def read_order(db: db_dependency, order_id: int = Path(gt=0)):
     """
     Fetch a order by its ID from the database.
     Args:
@@ -264,36 +285,14 @@ def read_order(db: db_dependency, order_id: int = Path(gt=0)):
                        database error, or any other unexpected error.
     """
 
-    try:
-        stmt = select(OrderHeader).where(OrderHeader.order_id == order_id)
-        order_model = db.execute(stmt).scalars().first()
+    order_model = await db.get(
+        OrderHeader, order_id, options=[selectinload(OrderHeader.order_lines)]
+    )
 
-        if order_model is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"order with id {order_id} not found.",
-            )
-
-        return order_model
-
-    except IntegrityError as e:
-        logging.error(f"Integrity error occurred: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.orig))
-    except SQLAlchemyError as e:
-        logging.error(f"Database error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred while fetching the order with id {order_id}.",
-        )
-    except HTTPException as e:
-        logging.error(f"HTTPException: {str(e)}")
-        raise HTTPException(
-            status_code=e.status_code,
-            detail=e.detail,
-        )
-    except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}")
+    if order_model is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred while fetching the order with id {order_id}.",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"order with id {order_id} not found.",
         )
+
+    return order_model
@@ -1,4 +1,5 @@
 import os
+from functools import cached_property
 from pydantic_settings import BaseSettings
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
@@ -27,12 +28,12 @@ class Settings(BaseSettings):
     BCRYPT_SCHEMES: list[str] = ["bcrypt"]
     DEPRECATED: str = "auto"
 
-    # You can create the instances outside the class
-    @property
+    # You can create the instances outside the class, they are built once on first access
+    @cached_property
     def bcrypt_context(self) -> CryptContext:
         return CryptContext(schemes=self.BCRYPT_SCHEMES, deprecated=self.DEPRECATED)
 
-    @property
+    @cached_property
     def oauth2_bearer(self) -> OAuth2PasswordBearer:
         return OAuth2PasswordBearer(tokenUrl="auth/token")
 
@@ -62,6 +63,21 @@ class Settings(BaseSettings):
             return "sqlite:///:memory:"
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    # Create an async connection string for the application, Alembic migrations keep using the sync one above
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URL(self) -> str:
+        if os.getenv("ENV") == "test":
+            return "sqlite+aiosqlite:///:memory:"
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    # Configuration for the database connection pool (ignored for SQLite)
+    # Each Uvicorn worker has its own pool, so the service can open up to
+    # UVICORN_WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections, 60 with the defaults and one worker.
+    # Keep this below the PostgreSQL max_connections (100 by default).
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 40))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Seconds
+
     # DB Connection for SQLite for local development
     # @computed_field
     # @property
@@ -1,20 +1,30 @@
+import copy
+import hashlib
+import threading
+import time
 from datetime import datetime, timezone
-from jose import JWTError, jwt
+from cachetools import TTLCache
+import jwt
 from typing import Annotated
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from app.core.config import settings
 from app.db.base import get_db
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
 
 security = HTTPBearer()
 
 
+# Decoded token payloads keyed by a digest of the token, entries never outlive the token itself
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+_token_cache_lock = threading.Lock()
+
+
 # This function is used to validate the JWT token and extract the payload.
 def validate_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -28,6 +38,23 @@ def validate_token(
 
     authorization_token = credentials.credentials
 
+    # Reuse the payload of a token that was already validated and has not expired yet,
+    # each request gets its own copy so that changes to it do not leak into other requests
+    cache_key = hashlib.blake2b(authorization_token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        cached_payload = _token_cache.get(cache_key)
+    if cached_payload is not None and cached_payload["exp"] > time.time():
+        return copy.deepcopy(cached_payload)
+
+    payload = decode_token(authorization_token)
+    with _token_cache_lock:
+        _token_cache[cache_key] = copy.deepcopy(payload)
+
+    return payload
+
+
+# This function is used to decode the JWT token and validate its claims.
+def decode_token(authorization_token: str) -> dict:
     try:
         # Decode the JWT token
         payload = jwt.decode(
@@ -56,7 +83,7 @@ def validate_token(
 
         return payload
 
-    except JWTError as e:
+    except jwt.PyJWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token is invalid or expired.",
@@ -74,13 +101,11 @@ def check_permissions(required_permissions: list[str]):
         function: A permission checker function that raises an HTTPException if the user lacks the required permission.
     """
 
-    def permission_checker(payload: dict = Depends(validate_token)):
-        user_permissions = payload.get("permissions", [])
+    required = frozenset(required_permissions)
 
+    def permission_checker(payload: dict = Depends(validate_token)):
         # Check if user has one of the required permissions
-        if not any(
-            permission in user_permissions for permission in required_permissions
-        ):
+        if required.isdisjoint(payload.get("permissions", ())):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Operation not permitted because of insufficient permissions",
@@ -100,10 +125,11 @@ def check_roles(required_roles: list[str]):
         function: A role checker function that raises an HTTPException if the user lacks the required role.
     """
 
+    required = frozenset(required_roles)
+
     def role_checker(payload: dict = Depends(validate_token)):
-        user_roles = payload.get("roles", [])
         # Check if the user has the required role, match the role name, only one role is required
-        if not any(role in user_roles for role in required_roles):
+        if required.isdisjoint(payload.get("roles", ())):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Operation not permitted because of insufficient roles",
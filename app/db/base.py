@@ -1,25 +1,39 @@
 # Inside app/db/base.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import settings
 
-# SQLALCHEMY_DATABASE_URL = 'sqlite:///./app.db'
-SQLALCHEMY_DATABASE_URL = str(
-    settings.SQLALCHEMY_DATABASE_URL
-)  # "postgresql+psycopg://dbadmin:test123@db:5432/stox"
-engine = create_engine(SQLALCHEMY_DATABASE_URL)  # str(settings.SQLALCHEMY_DATABASE_URI)
+# SQLALCHEMY_ASYNC_DATABASE_URL = 'sqlite+aiosqlite:///./app.db'
+SQLALCHEMY_ASYNC_DATABASE_URL = str(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URL
+)  # "postgresql+asyncpg://dbadmin:test123@db:5432/stox"
+# Size the connection pool for concurrent requests, SQLite (used for tests) does not use a QueuePool
+engine_options = (
+    {}
+    if SQLALCHEMY_ASYNC_DATABASE_URL.startswith("sqlite")
+    else {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_use_lifo": True,
+    }
+)
+engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL, **engine_options
+)  # str(settings.SQLALCHEMY_DATABASE_URI)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Keep attributes loaded after commit, an expired attribute cannot be lazy loaded on an AsyncSession
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 # Base class to create models
 Base = declarative_base()
 
 
 # Dependency that will be used in the FastAPI routes to get a session
-def get_db():
+async def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, func
+from sqlalchemy import Column, DateTime, Index, Integer, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -19,5 +19,11 @@ class OrderHeader(Base):
     # Relationships
     order_lines = relationship("OrderLine", back_populates="order_header")
 
+    # Indexes matching the sort keys of the orders listing, order_id is the tie-breaker
+    __table_args__ = (
+        Index("ix_order_headers_created_at", "created_at", "order_id"),
+        Index("ix_order_headers_total_items", "total_items", "order_id"),
+    )
+
     def __repr__(self):
         return f"<OrderHeader(id={self.order_id}, User='{self.user_id}', Total Items='{self.total_items}')>"
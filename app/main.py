@@ -1,6 +1,12 @@
+import logging
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette import status
 from app.db.base import Base
 from app.db.base import engine
 from app.api.v1 import (
@@ -9,10 +15,31 @@ from app.api.v1 import (
 )
 from app.core.config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The schema is managed by Alembic migrations (see app/start.sh), only create the tables when explicitly asked
+    if os.getenv("RUN_CREATE_ALL") == "1":
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    # Share one pooled HTTP client across requests so calls to the other services reuse keep-alive connections
+    app.state.http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        timeout=10.0,
+    )
+    yield
+    await app.state.http_client.aclose()
+    # Close the pooled database connections of this worker
+    await engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
     description=settings.PROJECT_DESCRIPTION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Allow requests from the different services
@@ -30,7 +57,34 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-Base.metadata.create_all(bind=engine)
+
+# Turn errors raised by the endpoints into HTTP responses, instead of handling them in each endpoint.
+# These handlers run inside the middleware stack, so the responses keep their CORS headers.
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    logging.error("Integrity error occurred: %s", exc)
+    return ORJSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc.orig)}
+    )
+
+
+@app.exception_handler(SQLAlchemyError)
+async def database_error_handler(request: Request, exc: SQLAlchemyError):
+    logging.error("Database error: %s", exc)
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "A database error occurred while processing the request."},
+    )
+
+
+# AUTH-SERVICE or INVENTORY-SERVICE could not be reached or timed out
+@app.exception_handler(httpx.HTTPError)
+async def service_unavailable_handler(request: Request, exc: httpx.HTTPError):
+    logging.error("Error calling an upstream service: %r", exc)
+    return ORJSONResponse(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        content={"detail": "An upstream service could not be reached."},
+    )
 
 
 @app.get("/")
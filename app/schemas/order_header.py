@@ -1,6 +1,6 @@
 # Pydantic models for request/response validation, keep separate from database models
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
 from datetime import datetime
 from app.schemas.order_line import OrderLineCreateRequest, OrderLineReadRequest
@@ -26,5 +26,6 @@ class OrderHeaderReadRequest(BaseModel):
     updated_at: Optional[datetime] = None
     order_lines: list[OrderLineReadRequest] = []
 
-    class Config:
-        from_attributes = True  # Enables compatibility with SQLAlchemy models
+    model_config = ConfigDict(
+        from_attributes=True  # Enables compatibility with SQLAlchemy models
+    )
@@ -1,6 +1,6 @@
 # Pydantic models for request/response validation, keep separate from database models
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -18,5 +18,6 @@ class OrderLineReadRequest(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True  # Enables compatibility with SQLAlchemy models
+    model_config = ConfigDict(
+        from_attributes=True  # Enables compatibility with SQLAlchemy models
+    )
@@ -5,4 +5,7 @@ alembic upgrade head
 
 # Start the Uvicorn server
 # uvicorn app.main:app --host 0.0.0.0 --port 8002 --reload
-uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# Use uvloop and httptools, set UVICORN_WORKERS to the CPU limit of the container (nproc reports the node CPUs, not the limit)
+uvicorn app.main:app --host 0.0.0.0 --port 8000 \
+    --loop uvloop --http httptools \
+    --workers "${UVICORN_WORKERS:-1}" --backlog 2048
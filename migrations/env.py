@@ -83,7 +83,6 @@ def run_migrations_online() -> None:
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()  # type: ignore
     connectable = create_engine(configuration["sqlalchemy.url"])  # type: ignore
-    print(get_url())
     with connectable.connect() as connection:
         context.configure(connection=connection, target_metadata=target_metadata)
 
@@ -0,0 +1,53 @@
+import httpx
+import jwt
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Create the tables through the lifespan startup, the in-memory database is dropped when the engine is disposed on shutdown
+    monkeypatch.setenv("RUN_CREATE_ALL", "1")
+    with TestClient(app) as test_client:
+        http_client = app.state.http_client
+        yield test_client
+        # Restore the real client so that the lifespan shutdown closes it
+        app.state.http_client = http_client
+
+
+@pytest.fixture
+def mock_services(client):
+    """
+    Route the calls to AUTH-SERVICE and INVENTORY-SERVICE to a handler provided by the test.
+
+    The handler receives the httpx.Request and returns an httpx.Response or raises an httpx error.
+    """
+
+    handlers = []
+
+    def install(handler):
+        handlers[:] = [handler]
+
+    # One mock client per test, installing a handler only swaps the handler it dispatches to
+    mock_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: handlers[0](request))
+    )
+    app.state.http_client = mock_client
+    yield install
+    client.portal.call(mock_client.aclose)
+
+
+@pytest.fixture
+def auth_headers():
+    encode = {
+        "username": "manager",
+        "user_id": 1,
+        "roles": ["Manager"],
+        "permissions": ["manage_orders_ORDER_SERVICE", "view_orders_ORDER_SERVICE"],
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+    }
+    token = jwt.encode(encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
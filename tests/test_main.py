@@ -0,0 +1,64 @@
+import httpx
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def test_database_error_returns_500(client, auth_headers, mocker):
+    # Arrange
+    mocker.patch.object(AsyncSession, "execute", side_effect=SQLAlchemyError("boom"))
+
+    # Act
+    response = client.get("/orders/", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 500
+    assert response.json() == {
+        "detail": "A database error occurred while processing the request."
+    }
+
+
+def test_integrity_error_returns_400(client, auth_headers, mocker):
+    # Arrange
+    mocker.patch.object(
+        AsyncSession,
+        "execute",
+        side_effect=IntegrityError("INSERT", {}, Exception("duplicate key")),
+    )
+
+    # Act
+    response = client.get("/orders/", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 400
+    assert response.json() == {"detail": "duplicate key"}
+
+
+def test_unreachable_auth_service_returns_502(client, mock_services):
+    # Arrange
+    def auth_handler(request: httpx.Request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    mock_services(auth_handler)
+
+    # Act
+    response = client.post(
+        "/auth/token", data={"username": "manager", "password": "secret"}
+    )
+
+    # Assert
+    assert response.status_code == 502
+    assert response.json() == {"detail": "An upstream service could not be reached."}
+
+
+def test_non_json_auth_service_response_returns_502(client, mock_services):
+    # Arrange
+    mock_services(lambda request: httpx.Response(503, text="Service Unavailable"))
+
+    # Act
+    response = client.post(
+        "/auth/token", data={"username": "manager", "password": "secret"}
+    )
+
+    # Assert
+    assert response.status_code == 502
+    assert response.json() == {"detail": "AUTH-SERVICE returned an invalid response."}
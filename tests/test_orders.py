@@ -0,0 +1,182 @@
+import logging
+import httpx
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.models.order_header import OrderHeader
+from app.db.models.order_line import OrderLine
+
+
+async def count_rows(model):
+    async with SessionLocal() as db:
+        return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+def test_create_then_read_order(client, mock_services, auth_headers):
+    # Arrange
+    inventory_calls = []
+
+    def inventory_handler(request: httpx.Request):
+        inventory_calls.append(str(request.url))
+        return httpx.Response(200, json={})
+
+    mock_services(inventory_handler)
+    order_request = {
+        "user_id": 7,
+        "order_lines": [
+            {"item_id": 456, "quantity": 2},
+            {"item_id": 789, "quantity": 1},
+        ],
+    }
+
+    # Act
+    create_response = client.post("/orders/", json=order_request, headers=auth_headers)
+    order_id = create_response.json()["order"]
+    read_response = client.get(f"/orders/{order_id}", headers=auth_headers)
+
+    # Assert
+    assert create_response.status_code == 201
+    assert sorted(inventory_calls) == [
+        f"{settings.INVENTORY_SERVICE_BASE_URL}/items/456?change_quantity=2",
+        f"{settings.INVENTORY_SERVICE_BASE_URL}/items/789?change_quantity=1",
+    ]
+    assert read_response.status_code == 200
+    order = read_response.json()
+    assert order["order_id"] == order_id
+    assert order["user_id"] == 7
+    assert order["total_items"] == 2
+    assert sorted(
+        (line["line_number"], line["item_id"], line["quantity"])
+        for line in order["order_lines"]
+    ) == [(1, 456, 2), (2, 789, 1)]
+
+
+def test_read_order_not_found(client, auth_headers):
+    # Act
+    response = client.get("/orders/999", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 404
+
+
+def seed_orders(client, mock_services, auth_headers, line_counts):
+    mock_services(lambda request: httpx.Response(200, json={}))
+    order_ids = []
+    for line_count in line_counts:
+        order_request = {
+            "user_id": 7,
+            "order_lines": [
+                {"item_id": item_id, "quantity": 1}
+                for item_id in range(1, line_count + 1)
+            ],
+        }
+        response = client.post("/orders/", json=order_request, headers=auth_headers)
+        order_ids.append(response.json()["order"])
+    return order_ids
+
+
+def read_page(client, auth_headers, **params):
+    response = client.get("/orders/", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return [order["order_id"] for order in response.json()]
+
+
+def test_read_all_orders_pages_by_order_id(client, mock_services, auth_headers):
+    # Arrange
+    seed_orders(client, mock_services, auth_headers, [2, 1, 3, 1, 2])
+
+    # Act / Assert
+    assert read_page(client, auth_headers, limit=2) == [1, 2]
+    assert read_page(client, auth_headers, limit=2, after_id=2) == [3, 4]
+    assert read_page(client, auth_headers, limit=2, after_id=4) == [5]
+    assert read_page(client, auth_headers, limit=2, after_id=5) == []
+
+
+def test_read_all_orders_pages_ascending_with_tie_breaker(
+    client, mock_services, auth_headers
+):
+    # Arrange: total_items per order id is 1: 2, 2: 1, 3: 3, 4: 1, 5: 2
+    seed_orders(client, mock_services, auth_headers, [2, 1, 3, 1, 2])
+
+    # Act / Assert
+    params = {"order_by": "total_items", "limit": 2}
+    assert read_page(client, auth_headers, **params) == [2, 4]
+    assert read_page(client, auth_headers, **params, after_id=4) == [1, 5]
+    assert read_page(client, auth_headers, **params, after_id=5) == [3]
+    assert read_page(client, auth_headers, **params, after_id=3) == []
+
+
+def test_read_all_orders_pages_descending_with_tie_breaker(
+    client, mock_services, auth_headers
+):
+    # Arrange: total_items per order id is 1: 2, 2: 1, 3: 3, 4: 1, 5: 2
+    seed_orders(client, mock_services, auth_headers, [2, 1, 3, 1, 2])
+
+    # Act / Assert
+    params = {"order_by": "total_items", "ascending": False, "limit": 2}
+    assert read_page(client, auth_headers, **params) == [3, 5]
+    assert read_page(client, auth_headers, **params, after_id=5) == [1, 4]
+    assert read_page(client, auth_headers, **params, after_id=4) == [2]
+    assert read_page(client, auth_headers, **params, after_id=2) == []
+
+
+def test_read_all_orders_after_missing_order(client, auth_headers):
+    # Act
+    response = client.get("/orders/", params={"after_id": 42}, headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 404
+
+
+def test_read_all_orders_rejects_out_of_range_limit(client, auth_headers):
+    # Act / Assert
+    for limit in (-1, 0, 501):
+        response = client.get("/orders/", params={"limit": limit}, headers=auth_headers)
+        assert response.status_code == 422
+
+
+def test_create_order_rolls_back_when_an_item_update_fails(
+    client, mock_services, auth_headers, caplog
+):
+    # Arrange
+    inventory_calls = []
+
+    def inventory_handler(request: httpx.Request):
+        inventory_calls.append(str(request.url))
+        if request.url.path == "/items/789":
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path == "/items/321":
+            return httpx.Response(404, json={"detail": "Item not found"})
+        return httpx.Response(200, json={})
+
+    mock_services(inventory_handler)
+    order_request = {
+        "user_id": 7,
+        "order_lines": [
+            {"item_id": 456, "quantity": 2},
+            {"item_id": 789, "quantity": 1},
+            {"item_id": 321, "quantity": 1},
+        ],
+    }
+
+    # Act
+    with caplog.at_level(logging.ERROR):
+        response = client.post("/orders/", json=order_request, headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Failed to update item quantity"}
+    assert client.portal.call(count_rows, OrderHeader) == 0
+    assert client.portal.call(count_rows, OrderLine) == 0
+    assert "item_id=789" in caplog.text
+    assert "item_id=321" in caplog.text
+    assert "item_id=456" not in caplog.text
+    # Only the item that was updated is reverted
+    assert sorted(inventory_calls) == sorted(
+        [
+            f"{settings.INVENTORY_SERVICE_BASE_URL}/items/456?change_quantity=2",
+            f"{settings.INVENTORY_SERVICE_BASE_URL}/items/789?change_quantity=1",
+            f"{settings.INVENTORY_SERVICE_BASE_URL}/items/321?change_quantity=1",
+            f"{settings.INVENTORY_SERVICE_BASE_URL}/items/456?change_quantity=-2",
+        ]
+    )
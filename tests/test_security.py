@@ -1,8 +1,9 @@
-from http.client import HTTPException
+from fastapi import HTTPException
 import pytest
 from datetime import timedelta, datetime, timezone
-from jose import jwt
-from app.core.security import validate_token
+import jwt
+from app.core import security
+from app.core.security import check_permissions, check_roles, validate_token
 from app.core.config import settings
 
 
@@ -35,3 +36,76 @@ def test_validate_token_valid():
     assert payload["permissions"] == permissions
 
 
+def test_check_permissions_allows_any_matching_permission():
+    # Arrange
+    permission_checker = check_permissions(["manage_orders", "view_orders"])
+    payload = {"permissions": ["view_orders"]}
+
+    # Act / Assert
+    permission_checker(payload)
+
+
+def test_check_permissions_rejects_missing_permission():
+    # Arrange
+    permission_checker = check_permissions(["manage_orders"])
+    payload = {"permissions": ["view_orders"]}
+
+    # Act / Assert
+    with pytest.raises(HTTPException) as exc_info:
+        permission_checker(payload)
+    assert exc_info.value.status_code == 403
+
+
+def test_check_roles_rejects_payload_without_roles():
+    # Arrange
+    role_checker = check_roles(["admin"])
+
+    # Act / Assert
+    with pytest.raises(HTTPException) as exc_info:
+        role_checker({})
+    assert exc_info.value.status_code == 403
+
+
+def test_validate_token_reuses_cached_payload(mocker):
+    # Arrange
+    encode = {
+        "username": "cacheduser",
+        "user_id": 2,
+        "roles": [],
+        "permissions": [],
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+    }
+    token = jwt.encode(encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+    credentials = type("HTTPAuthorizationCredentials", (object,), {"credentials": token})
+    decode_spy = mocker.spy(security.jwt, "decode")
+
+    # Act
+    first_payload = validate_token(credentials)
+    second_payload = validate_token(credentials)
+
+    # Assert
+    assert first_payload == second_payload
+    assert decode_spy.call_count == 1
+
+
+def test_validate_token_cached_payload_is_not_shared():
+    # Arrange
+    encode = {
+        "username": "shareduser",
+        "user_id": 3,
+        "roles": [],
+        "permissions": ["read"],
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+    }
+    token = jwt.encode(encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+    credentials = type("HTTPAuthorizationCredentials", (object,), {"credentials": token})
+
+    # Act
+    first_payload = validate_token(credentials)
+    first_payload["permissions"].append("write")
+    first_payload["username"] = "changed"
+    second_payload = validate_token(credentials)
+
+    # Assert
+    assert second_payload["username"] == "shareduser"
+    assert second_payload["permissions"] == ["read"]